@@ -1,14 +1,63 @@
+import functools
 import json
+import logging
+import logging.handlers
+import queue
+import re
+import sys
+import time
 import asyncio
+from collections import defaultdict, deque
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Final, List, Optional
 from uagents import Agent, Context, Protocol
 from pydantic import BaseModel, Field
 
-class AgentAddresses:
-    PROPOSAL_ANALYSIS = "agent1qw037h6333hn42ze6qtqu50hcpnz6pderfk3p3dw7djq08tgjnvfs9eqncv"
-    VOTER_SENTIMENT = "agent1qgn3epnffmzs5dfyya33lluan8m6uvln8wrl2heef7dhas3vz9k2v8kmdet"
-    EXECUTION_AUTOMATION = "agent1qdh8ce35zesj89978n5phrjvydzwfnnneyha2rjw5c9ezt6vs86a5nwj0dw"
+# Route log records through a queue so formatting and handler I/O happen on a
+# background thread; the event loop only pays for a queue put per log call.
+_LOG_QUEUE = queue.SimpleQueue()
+_LOG_LISTENER: Optional[logging.handlers.QueueListener] = None
+
+def _install_queue_logging(agent_logger: logging.Logger) -> None:
+    """Move the agent logger's handlers behind a QueueListener thread.
+
+    Runs from the startup event — after uagents has configured logging — and
+    walks up from ctx.logger to whichever ancestor actually owns the handlers
+    that process agent records, so the swap targets the handlers in effect
+    rather than whatever the root logger held at import time.
+    """
+    global _LOG_LISTENER
+    if _LOG_LISTENER is not None:
+        return
+    target = agent_logger
+    while not target.handlers and target.propagate and target.parent is not None:
+        target = target.parent
+    if not target.handlers or any(
+        isinstance(h, logging.handlers.QueueHandler) for h in target.handlers
+    ):
+        return
+    _LOG_LISTENER = logging.handlers.QueueListener(
+        _LOG_QUEUE, *target.handlers, respect_handler_level=True
+    )
+    target.handlers = [logging.handlers.QueueHandler(_LOG_QUEUE)]
+    _LOG_LISTENER.start()
+
+# Timestamps only carry second resolution here, so reuse the formatted ISO
+# string for all messages produced within the same second.
+_TS_CACHE = [0, ""]
+def _utcnow_iso() -> str:
+    t = int(time.time())
+    if t != _TS_CACHE[0]:
+        _TS_CACHE[0] = t
+        _TS_CACHE[1] = datetime.utcfromtimestamp(t).isoformat()
+    return _TS_CACHE[1]
+
+# Downstream agent addresses. Module-level Final constants skip the class
+# attribute lookup, and interning makes address equality a pointer compare.
+PROPOSAL_ANALYSIS_ADDR: Final[str] = sys.intern("agent1qw037h6333hn42ze6qtqu50hcpnz6pderfk3p3dw7djq08tgjnvfs9eqncv")
+VOTER_SENTIMENT_ADDR: Final[str] = sys.intern("agent1qgn3epnffmzs5dfyya33lluan8m6uvln8wrl2heef7dhas3vz9k2v8kmdet")
+EXECUTION_AUTOMATION_ADDR: Final[str] = sys.intern("agent1qdh8ce35zesj89978n5phrjvydzwfnnneyha2rjw5c9ezt6vs86a5nwj0dw")
 
 class ProposalSubmission(BaseModel):
     proposal_id: str = Field(..., description="Unique proposal ID")
@@ -38,7 +87,7 @@ class ComprehensiveAnalysis(BaseModel):
     final_recommendation: str = Field(..., description="Overall recommendation")
     confidence_score: float = Field(..., ge=0.0, le=1.0, description="Overall confidence")
     risk_assessment: str = Field(..., description="Overall risk level")
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = Field(default_factory=_utcnow_iso)
 
 class UserQuery(BaseModel):
     query: str = Field(..., description="Natural language query about proposals")
@@ -53,6 +102,7 @@ class QueryResponse(BaseModel):
 
 class StatusRequest(BaseModel):
     proposal_id: str = Field(..., description="Proposal ID to check")
+    wait_seconds: float = Field(default=0.0, ge=0.0, description="Optionally wait this long for the workflow to complete before responding")
 
 class ProposalAnalysisRequest(BaseModel):
     proposal_id: str = Field(..., description="Unique proposal identifier")
@@ -76,7 +126,7 @@ class ProposalAnalysisResponse(BaseModel):
     similar_proposals: List[Dict] = Field(default_factory=list, description="Similar historical proposals")
     recommendations: List[str] = Field(default_factory=list, description="Recommendations")
     confidence_score: float = Field(..., ge=0.0, le=1.0, description="Analysis confidence")
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = Field(default_factory=_utcnow_iso)
 
 class ProposalRequest(BaseModel):
     proposal_id: str = Field(..., description="Proposal to analyze")
@@ -90,6 +140,7 @@ class ProposalResponse(BaseModel):
     vote_breakdown: Dict[str, int] = Field(..., description="Vote count breakdown")
     key_influencers: List[str] = Field(..., description="Most influential users")
     risk_factors: List[str] = Field(..., description="Identified risks")
+    partial: bool = Field(default=False, description="True for interim results sent before all sentiment is analyzed")
 
 class ApprovedProposal(BaseModel):
     proposal_id: str = Field(..., description="Unique proposal identifier")
@@ -108,108 +159,230 @@ class ExecutionResponse(BaseModel):
     safety_check: Optional[Dict] = None
     execution_plan: Optional[Dict] = None
 
+# Internal workflow state lives in slotted dataclasses: the orchestrator mutates
+# these on every stage completion, so skip Pydantic's per-attribute validation
+# cost and keep the Pydantic models above purely as wire types for ctx.send.
+@dataclass(slots=True)
+class WorkflowState:
+    proposal_id: str
+    current_stage: str
+    analysis_complete: bool = False
+    sentiment_analysis_complete: bool = False
+    execution_plan_ready: bool = False
+    warnings: List[str] = field(default_factory=list)
+    progress_percentage: float = 0.0
+
+@dataclass(slots=True)
+class AnalysisState:
+    proposal_id: str
+    final_recommendation: str
+    confidence_score: float
+    risk_assessment: str
+    proposal_analysis: Optional[Dict] = None
+    sentiment_prediction: Optional[Dict] = None
+    execution_plan: Optional[Dict] = None
+    timestamp: str = field(default_factory=_utcnow_iso)
+
+# Interned stage names: repeated equality checks reduce to pointer compares
+# and every workflow shares the same string objects
+_STAGE_ANALYSIS = sys.intern("proposal_analysis")
+_STAGE_SENTIMENT = sys.intern("sentiment_analysis")
+_STAGE_EXEC = sys.intern("execution_planning")
+_STAGE_DONE = sys.intern("completed")
+
+# Stage-completion bits packed into a single int per workflow
+STAGE_PROPOSAL = 1
+STAGE_SENTIMENT = 2
+STAGE_EXECUTION = 4
+STAGE_ALL = STAGE_PROPOSAL | STAGE_SENTIMENT | STAGE_EXECUTION
+
 class WorkflowOrchestrator:
     def __init__(self):
-        self.workflows: Dict[str, WorkflowStatus] = {}
-        self.analysis_results: Dict[str, ComprehensiveAnalysis] = {}
-        self.pending_responses: Dict[str, Dict] = {}
-        
-    def start_workflow(self, proposal: ProposalSubmission) -> WorkflowStatus:
-        status = WorkflowStatus(
+        self.workflows: Dict[str, WorkflowState] = {}
+        self.analysis_results: Dict[str, AnalysisState] = {}
+        self.pending_flags: Dict[str, int] = {}
+        # Set when a workflow completes so callers can await instead of polling
+        self._completion_events: Dict[str, asyncio.Event] = {}
+        # Bounded per-proposal error history: long-running coordinators keep
+        # only the most recent errors instead of growing lists forever
+        self._errors: Dict[str, deque] = defaultdict(lambda: deque(maxlen=16))
+        # Maintained incrementally so summary queries are O(1) instead of
+        # scanning every workflow/analysis on each request
+        self._counters = {"completed": 0, "approved": 0, "rejected": 0}
+
+    def start_workflow(self, proposal: ProposalSubmission) -> WorkflowState:
+        # Resubmission of a known proposal_id: back out the old run's
+        # contribution to the incremental counters before its state is
+        # replaced, or summary totals drift (completed > total)
+        old = self.workflows.get(proposal.proposal_id)
+        if old is not None:
+            if old.progress_percentage == 100.0:
+                self._counters["completed"] -= 1
+            old_analysis = self.analysis_results.get(proposal.proposal_id)
+            if old_analysis is not None:
+                self._adjust_outcome_counter(old_analysis.final_recommendation, -1)
+        status = WorkflowState(
             proposal_id=proposal.proposal_id,
-            current_stage="proposal_analysis",
+            current_stage=_STAGE_ANALYSIS,
             progress_percentage=10.0
         )
         self.workflows[proposal.proposal_id] = status
-        self.analysis_results[proposal.proposal_id] = ComprehensiveAnalysis(
+        self.analysis_results[proposal.proposal_id] = AnalysisState(
             proposal_id=proposal.proposal_id,
             final_recommendation="Analysis in progress...",
             confidence_score=0.0,
             risk_assessment="Unknown"
         )
-        self.pending_responses[proposal.proposal_id] = {
-            "proposal_analysis": False,
-            "sentiment_analysis": False,
-            "execution_planning": False
-        }
+        self.pending_flags[proposal.proposal_id] = 0
+        self._completion_events[proposal.proposal_id] = asyncio.Event()
         return status
     
     def complete_analysis_stage(self, proposal_id: str, stage: str, success: bool, data: Dict):
         if proposal_id not in self.workflows:
             return
         workflow = self.workflows[proposal_id]
-        if stage == "proposal_analysis":
+        if stage == _STAGE_ANALYSIS:
             workflow.analysis_complete = success
             if success:
                 workflow.progress_percentage = 40.0
-                workflow.current_stage = "sentiment_analysis"
+                workflow.current_stage = _STAGE_SENTIMENT
                 self.analysis_results[proposal_id].proposal_analysis = data
-                self.pending_responses[proposal_id]["proposal_analysis"] = True
-        elif stage == "sentiment_analysis":
+                self.pending_flags[proposal_id] |= STAGE_PROPOSAL
+        elif stage == _STAGE_SENTIMENT:
             workflow.sentiment_analysis_complete = success
             if success:
                 workflow.progress_percentage = 70.0
-                workflow.current_stage = "execution_planning"
+                workflow.current_stage = _STAGE_EXEC
                 self.analysis_results[proposal_id].sentiment_prediction = data
-                self.pending_responses[proposal_id]["sentiment_analysis"] = True
-        elif stage == "execution_planning":
+                self.pending_flags[proposal_id] |= STAGE_SENTIMENT
+        elif stage == _STAGE_EXEC:
             workflow.execution_plan_ready = success
             if success:
+                if workflow.progress_percentage != 100.0:
+                    self._counters["completed"] += 1
                 workflow.progress_percentage = 100.0
-                workflow.current_stage = "completed"
+                workflow.current_stage = _STAGE_DONE
                 self.analysis_results[proposal_id].execution_plan = data
-                self.pending_responses[proposal_id]["execution_planning"] = True
+                self.pending_flags[proposal_id] |= STAGE_EXECUTION
                 self.generate_final_recommendation(proposal_id)
+                event = self._completion_events.get(proposal_id)
+                if event is not None:
+                    event.set()
+
+    async def wait_for_completion(self, proposal_id: str, timeout: float) -> bool:
+        event = self._completion_events.get(proposal_id)
+        if event is None:
+            return False
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
     
     def generate_final_recommendation(self, proposal_id: str):
         if proposal_id not in self.analysis_results:
             return
         analysis = self.analysis_results[proposal_id]
-        confidence_scores = []
-        risk_factors = []
-        if analysis.proposal_analysis:
-            if analysis.proposal_analysis.get("compliance", False):
-                confidence_scores.append(0.8)
-            else:
-                confidence_scores.append(0.2)
-                risk_factors.append("Compliance issues")
-            financial_risk = analysis.proposal_analysis.get("risk_assessment", {}).get("overall_risk", "MEDIUM")
-            if financial_risk == "HIGH":
-                risk_factors.append("High financial risk")
-        if analysis.sentiment_prediction:
-            pred_confidence = analysis.sentiment_prediction.get("confidence", 0.0)
-            confidence_scores.append(pred_confidence)
-            prediction = analysis.sentiment_prediction.get("prediction", "Uncertain")
-            if prediction == "Fail":
-                risk_factors.append("Negative voter sentiment")
-            sentiment_risks = analysis.sentiment_prediction.get("risk_factors", [])
-            risk_factors.extend(sentiment_risks)
-        if analysis.execution_plan:
-            safety_check = analysis.execution_plan.get("safety_check", {})
-            if not safety_check.get("is_safe", False):
-                risk_factors.append("Execution safety concerns")
-                confidence_scores.append(0.3)
-            else:
-                confidence_scores.append(0.7)
-        overall_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0.0
-        if overall_confidence > 0.7 and len(risk_factors) == 0:
-            recommendation = "APPROVE - High confidence, low risk"
-            risk_level = "LOW"
-        elif overall_confidence > 0.5 and len(risk_factors) <= 1:
-            recommendation = "APPROVE WITH CONDITIONS - Moderate confidence"
-            risk_level = "MEDIUM" 
-        elif overall_confidence > 0.3:
-            recommendation = "DEFER - Requires additional review"
-            risk_level = "MEDIUM"
-        else:
-            recommendation = "REJECT - Low confidence or high risk"
-            risk_level = "HIGH"
+        pa = analysis.proposal_analysis
+        sp = analysis.sentiment_prediction
+        ep = analysis.execution_plan
+        # Fast paths: clearly-decided combinations skip the aggregation entirely
+        if pa is not None and sp is not None:
+            compliant = pa.get("compliance", False)
+            prediction = sp.get("prediction")
+            if not compliant and prediction == "Fail":
+                self._assign_outcome(analysis, "REJECT - Low confidence or high risk", 0.2, "HIGH")
+                return
+            pred_conf = round(sp.get("confidence", 0.0), 1)
+            if (compliant and prediction == "Pass" and pred_conf > 0.6
+                    and not sp.get("risk_factors")
+                    and pa.get("risk_assessment", {}).get("overall_risk", "MEDIUM") != "HIGH"
+                    and ep is not None and ep.get("safety_check", {}).get("is_safe", False)):
+                self._assign_outcome(analysis, "APPROVE - High confidence, low risk",
+                                     (1.5 + pred_conf) / 3, "LOW")
+                return
+        recommendation, overall_confidence, risk_level = _score(
+            pa is not None,
+            pa.get("compliance", False) if pa else False,
+            pa.get("risk_assessment", {}).get("overall_risk", "MEDIUM") if pa else "MEDIUM",
+            sp is not None,
+            # Bucket the sentiment confidence to one decimal so the cache can hit
+            round(sp.get("confidence", 0.0), 1) if sp else 0.0,
+            sp.get("prediction", "Uncertain") if sp else "Uncertain",
+            len(sp.get("risk_factors", [])) if sp else 0,
+            ep is not None,
+            ep.get("safety_check", {}).get("is_safe", False) if ep else False,
+        )
+        self._assign_outcome(analysis, recommendation, overall_confidence, risk_level)
+
+    def _assign_outcome(self, analysis: AnalysisState, recommendation: str,
+                        overall_confidence: float, risk_level: str):
+        if recommendation != analysis.final_recommendation:
+            self._adjust_outcome_counter(analysis.final_recommendation, -1)
+            self._adjust_outcome_counter(recommendation, 1)
         analysis.final_recommendation = recommendation
         analysis.confidence_score = overall_confidence
         analysis.risk_assessment = risk_level
 
+    def record_error(self, proposal_id: str, message: str):
+        self._errors[proposal_id].append(message)
+
+    def get_errors(self, proposal_id: str):
+        return self._errors.get(proposal_id, ())
+
+    def _adjust_outcome_counter(self, recommendation: str, delta: int):
+        if "APPROVE" in recommendation:
+            self._counters["approved"] += delta
+        elif "REJECT" in recommendation:
+            self._counters["rejected"] += delta
+
+@functools.lru_cache(maxsize=4096)
+def _score(has_analysis: bool, compliance: bool, financial_risk: str,
+           has_sentiment: bool, pred_confidence: float, prediction: str, sentiment_risk_count: int,
+           has_execution: bool, is_safe: bool):
+    """Pure decision kernel for the final recommendation; memoized on its scalar inputs."""
+    confidence_scores = []
+    risk_count = 0
+    if has_analysis:
+        if compliance:
+            confidence_scores.append(0.8)
+        else:
+            confidence_scores.append(0.2)
+            risk_count += 1
+        if financial_risk == "HIGH":
+            risk_count += 1
+    if has_sentiment:
+        confidence_scores.append(pred_confidence)
+        if prediction == "Fail":
+            risk_count += 1
+        risk_count += sentiment_risk_count
+    if has_execution:
+        if not is_safe:
+            risk_count += 1
+            confidence_scores.append(0.3)
+        else:
+            confidence_scores.append(0.7)
+    overall_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0.0
+    if overall_confidence > 0.7 and risk_count == 0:
+        recommendation = "APPROVE - High confidence, low risk"
+        risk_level = "LOW"
+    elif overall_confidence > 0.5 and risk_count <= 1:
+        recommendation = "APPROVE WITH CONDITIONS - Moderate confidence"
+        risk_level = "MEDIUM"
+    elif overall_confidence > 0.3:
+        recommendation = "DEFER - Requires additional review"
+        risk_level = "MEDIUM"
+    else:
+        recommendation = "REJECT - Low confidence or high risk"
+        risk_level = "HIGH"
+    return recommendation, overall_confidence, risk_level
+
 orchestrator = WorkflowOrchestrator()
 
+# Default reviewer cohort for sentiment prediction; shared across requests so
+# the handler doesn't rebuild the list per message
+_DEFAULT_USERS = ["alice", "bob", "charlie", "dave", "eve"]
+
 from uagents_core.contrib.protocols.chat import (
     ChatAcknowledgement,
     ChatMessage,
@@ -226,9 +399,11 @@ chat_protocol = Protocol(spec=chat_protocol_spec)
 @coordinator_protocol.on_message(model=ProposalSubmission, replies={WorkflowStatus})
 async def handle_proposal_submission(ctx: Context, sender: str, msg: ProposalSubmission):
     try:
-        ctx.logger.info(f"Starting real agent workflow for proposal {msg.proposal_id}")
+        ctx.logger.info("Starting real agent workflow for proposal %s", msg.proposal_id)
         status = orchestrator.start_workflow(msg)
-        analysis_request = ProposalAnalysisRequest(
+        # Fields come straight from the already-validated submission, so skip
+        # re-running the validators on the outbound request
+        analysis_request = ProposalAnalysisRequest.model_construct(
             proposal_id=msg.proposal_id,
             proposal_text=f"Title: {msg.title}\nDescription: {msg.description}",
             requested_amount=msg.requested_amount,
@@ -238,11 +413,18 @@ async def handle_proposal_submission(ctx: Context, sender: str, msg: ProposalSub
             category=msg.category,
             treasury_balance=1000.0
         )
-        await ctx.send(AgentAddresses.PROPOSAL_ANALYSIS, analysis_request)
-        ctx.logger.info(f"Sent analysis request to {AgentAddresses.PROPOSAL_ANALYSIS}")
-        await ctx.send(sender, status)
+        # Both sends are independent, so overlap them instead of paying two RTTs
+        results = await asyncio.gather(
+            ctx.send(PROPOSAL_ANALYSIS_ADDR, analysis_request),
+            ctx.send(sender, WorkflowStatus(**asdict(status), errors=list(orchestrator.get_errors(status.proposal_id)))),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                ctx.logger.error("Error sending workflow message: %s", result)
+        ctx.logger.info("Sent analysis request to %s", PROPOSAL_ANALYSIS_ADDR)
     except Exception as e:
-        ctx.logger.error(f"Error starting workflow: {e}")
+        ctx.logger.error("Error starting workflow: %s", e)
         error_status = WorkflowStatus(
             proposal_id=msg.proposal_id,
             current_stage="error",
@@ -254,7 +436,7 @@ async def handle_proposal_submission(ctx: Context, sender: str, msg: ProposalSub
 @coordinator_protocol.on_message(model=ProposalAnalysisResponse)
 async def handle_proposal_analysis_response(ctx: Context, sender: str, msg: ProposalAnalysisResponse):
     try:
-        ctx.logger.info(f"Received proposal analysis for {msg.proposal_id}")
+        ctx.logger.info("Received proposal analysis for %s", msg.proposal_id)
         analysis_data = {
             "compliance": msg.compliance,
             "violations": msg.violations,
@@ -263,23 +445,29 @@ async def handle_proposal_analysis_response(ctx: Context, sender: str, msg: Prop
             "risk_assessment": msg.risk_assessment,
             "confidence_score": msg.confidence_score
         }
-        orchestrator.complete_analysis_stage(msg.proposal_id, "proposal_analysis", True, analysis_data)
+        orchestrator.complete_analysis_stage(msg.proposal_id, _STAGE_ANALYSIS, True, analysis_data)
         voter_request = ProposalRequest(
             proposal_id=msg.proposal_id,
-            user_list=["alice", "bob", "charlie", "dave", "eve"],
+            user_list=_DEFAULT_USERS,
             proposal_text=f"Analysis: {msg.reasoning_trace}"
         )
-        await ctx.send(AgentAddresses.VOTER_SENTIMENT, voter_request)
-        ctx.logger.info(f"Sent to voter sentiment agent: {AgentAddresses.VOTER_SENTIMENT}")
+        await ctx.send(VOTER_SENTIMENT_ADDR, voter_request)
+        ctx.logger.info("Sent to voter sentiment agent: %s", VOTER_SENTIMENT_ADDR)
     except Exception as e:
-        ctx.logger.error(f"Error processing proposal analysis response: {e}")
+        ctx.logger.error("Error processing proposal analysis response: %s", e)
         if msg.proposal_id in orchestrator.workflows:
-            orchestrator.workflows[msg.proposal_id].errors.append(str(e))
+            orchestrator.record_error(msg.proposal_id, str(e))
 
 @coordinator_protocol.on_message(model=ProposalResponse)
 async def handle_voter_sentiment_response(ctx: Context, sender: str, msg: ProposalResponse):
     try:
-        ctx.logger.info(f"Received voter sentiment analysis for {msg.proposal_id}")
+        if msg.partial:
+            # Interim frame sent while the voter agent's sentiment batch is
+            # still running; wait for the final response before advancing the
+            # workflow, otherwise the execution request would fire twice
+            ctx.logger.info("Ignoring interim sentiment response for %s", msg.proposal_id)
+            return
+        ctx.logger.info("Received voter sentiment analysis for %s", msg.proposal_id)
         sentiment_data = {
             "prediction": msg.prediction,
             "confidence": msg.confidence,
@@ -287,27 +475,29 @@ async def handle_voter_sentiment_response(ctx: Context, sender: str, msg: Propos
             "key_influencers": msg.key_influencers,
             "risk_factors": msg.risk_factors
         }
-        orchestrator.complete_analysis_stage(msg.proposal_id, "sentiment_analysis", True, sentiment_data)
+        orchestrator.complete_analysis_stage(msg.proposal_id, _STAGE_SENTIMENT, True, sentiment_data)
         if msg.proposal_id in orchestrator.analysis_results:
             proposal_analysis = orchestrator.analysis_results[msg.proposal_id].proposal_analysis
-            execution_request = ApprovedProposal(
+            execution_request = ApprovedProposal.model_construct(
                 proposal_id=msg.proposal_id,
                 proposal_text="Approved proposal for execution planning",
                 execution_instructions=f"Execute as planned with {msg.prediction} voter sentiment",
                 budget_amount=proposal_analysis.get("financial_impact", {}).get("requested_amount", 0),
-                token_type=proposal_analysis.get("financial_impact", {}).get("token_type", "ETH")
+                token_type=proposal_analysis.get("financial_impact", {}).get("token_type", "ETH"),
+                recipient_address=None,
+                deadline=None
             )
-            await ctx.send(AgentAddresses.EXECUTION_AUTOMATION, execution_request)
-            ctx.logger.info(f"Sent to execution agent: {AgentAddresses.EXECUTION_AUTOMATION}")
+            await ctx.send(EXECUTION_AUTOMATION_ADDR, execution_request)
+            ctx.logger.info("Sent to execution agent: %s", EXECUTION_AUTOMATION_ADDR)
     except Exception as e:
-        ctx.logger.error(f"Error processing voter sentiment response: {e}")
+        ctx.logger.error("Error processing voter sentiment response: %s", e)
         if msg.proposal_id in orchestrator.workflows:
-            orchestrator.workflows[msg.proposal_id].errors.append(str(e))
+            orchestrator.record_error(msg.proposal_id, str(e))
 
 @coordinator_protocol.on_message(model=ExecutionResponse)
 async def handle_execution_response(ctx: Context, sender: str, msg: ExecutionResponse):
     try:
-        ctx.logger.info(f"Received execution plan for {msg.proposal_id}")
+        ctx.logger.info("Received execution plan for %s", msg.proposal_id)
         execution_data = {
             "success": msg.success,
             "message": msg.message,
@@ -315,58 +505,74 @@ async def handle_execution_response(ctx: Context, sender: str, msg: ExecutionRes
             "safety_check": msg.safety_check,
             "execution_plan": msg.execution_plan
         }
-        orchestrator.complete_analysis_stage(msg.proposal_id, "execution_planning", msg.success, execution_data)
-        ctx.logger.info(f"Workflow completed for {msg.proposal_id}")
+        orchestrator.complete_analysis_stage(msg.proposal_id, _STAGE_EXEC, msg.success, execution_data)
+        ctx.logger.info("Workflow completed for %s", msg.proposal_id)
     except Exception as e:
-        ctx.logger.error(f"Error processing execution response: {e}")
+        ctx.logger.error("Error processing execution response: %s", e)
         if msg.proposal_id in orchestrator.workflows:
-            orchestrator.workflows[msg.proposal_id].errors.append(str(e))
+            orchestrator.record_error(msg.proposal_id, str(e))
+
+def _query_status(msg: UserQuery):
+    if not msg.proposal_id:
+        return None
+    if msg.proposal_id in orchestrator.workflows:
+        workflow = orchestrator.workflows[msg.proposal_id]
+        parts = [f"Proposal {msg.proposal_id} is in '{workflow.current_stage}' stage. Progress: {workflow.progress_percentage:.1f}%"]
+        if workflow.analysis_complete:
+            parts.append(" Analysis: Complete.")
+        if workflow.sentiment_analysis_complete:
+            parts.append(" Sentiment: Complete.")
+        if workflow.execution_plan_ready:
+            parts.append(" Execution plan: Ready.")
+        errors = orchestrator.get_errors(msg.proposal_id)
+        if errors:
+            parts.append(f" Errors: {', '.join(errors)}")
+        return "".join(parts), ["workflow_tracker"], 0.9
+    return f"No workflow found for proposal {msg.proposal_id}", [], 0.8
+
+def _query_recommendation(msg: UserQuery):
+    if not msg.proposal_id:
+        return None
+    if msg.proposal_id in orchestrator.analysis_results:
+        analysis = orchestrator.analysis_results[msg.proposal_id]
+        response_text = (
+            f"Recommendation for {msg.proposal_id}: {analysis.final_recommendation}"
+            f" Confidence: {analysis.confidence_score:.2f}"
+            f" Risk: {analysis.risk_assessment}"
+        )
+        return response_text, ["comprehensive_analysis"], analysis.confidence_score
+    return f"Analysis not complete for proposal {msg.proposal_id}", [], 0.3
+
+def _query_summary(msg: UserQuery):
+    total_proposals = len(orchestrator.workflows)
+    completed_workflows = orchestrator._counters["completed"]
+    in_progress = total_proposals - completed_workflows
+    response_text = f"DAO Summary: {total_proposals} total proposals, {completed_workflows} completed, {in_progress} in progress"
+    return response_text, ["workflow_tracker"], 0.9
+
+# Keyword handlers checked in order against the lowercased query (one pass each)
+_QUERY_HANDLERS = (
+    ("status", _query_status),
+    ("recommendation", _query_recommendation),
+    ("summary", _query_summary),
+)
 
 @coordinator_protocol.on_message(model=UserQuery, replies={QueryResponse})
 async def handle_user_query(ctx: Context, sender: str, msg: UserQuery):
     try:
-        ctx.logger.info(f"Processing query from {msg.user_id}: {msg.query}")
+        ctx.logger.info("Processing query from %s: %s", msg.user_id, msg.query)
         query_lower = msg.query.lower()
-        response_text = "Query processed successfully"
-        data_sources = []
-        confidence = 0.5
-        if "status" in query_lower and msg.proposal_id:
-            if msg.proposal_id in orchestrator.workflows:
-                workflow = orchestrator.workflows[msg.proposal_id]
-                response_text = f"Proposal {msg.proposal_id} is in '{workflow.current_stage}' stage. Progress: {workflow.progress_percentage:.1f}%"
-                if workflow.analysis_complete:
-                    response_text += " Analysis: Complete."
-                if workflow.sentiment_analysis_complete:
-                    response_text += " Sentiment: Complete."
-                if workflow.execution_plan_ready:
-                    response_text += " Execution plan: Ready."
-                if workflow.errors:
-                    response_text += f" Errors: {', '.join(workflow.errors)}"
-                data_sources = ["workflow_tracker"]
-                confidence = 0.9
-            else:
-                response_text = f"No workflow found for proposal {msg.proposal_id}"
-                confidence = 0.8
-        elif "recommendation" in query_lower and msg.proposal_id:
-            if msg.proposal_id in orchestrator.analysis_results:
-                analysis = orchestrator.analysis_results[msg.proposal_id]
-                response_text = f"Recommendation for {msg.proposal_id}: {analysis.final_recommendation}"
-                response_text += f" Confidence: {analysis.confidence_score:.2f}"
-                response_text += f" Risk: {analysis.risk_assessment}"
-                data_sources = ["comprehensive_analysis"]
-                confidence = analysis.confidence_score
-            else:
-                response_text = f"Analysis not complete for proposal {msg.proposal_id}"
-                confidence = 0.3
-        elif "summary" in query_lower:
-            total_proposals = len(orchestrator.workflows)
-            completed_workflows = len([w for w in orchestrator.workflows.values() if w.progress_percentage == 100.0])
-            in_progress = total_proposals - completed_workflows
-            response_text = f"DAO Summary: {total_proposals} total proposals, {completed_workflows} completed, {in_progress} in progress"
-            data_sources = ["workflow_tracker"]
-            confidence = 0.9
+        result = None
+        for keyword, handler in _QUERY_HANDLERS:
+            if keyword in query_lower:
+                result = handler(msg)
+                if result is not None:
+                    break
+        if result is not None:
+            response_text, data_sources, confidence = result
         else:
             response_text = "I can help with: proposal status, recommendations, summary. Try asking 'What is the status of prop_123?'"
+            data_sources = []
             confidence = 0.7
         response = QueryResponse(
             query=msg.query,
@@ -376,8 +582,8 @@ async def handle_user_query(ctx: Context, sender: str, msg: UserQuery):
         )
         await ctx.send(sender, response)
     except Exception as e:
-        ctx.logger.error(f"Error processing query: {e}")
-        error_response = QueryResponse(
+        ctx.logger.error("Error processing query: %s", e)
+        error_response = QueryResponse.model_construct(
             query=msg.query,
             response=f"Error processing query: {str(e)}",
             data_sources=[],
@@ -388,10 +594,12 @@ async def handle_user_query(ctx: Context, sender: str, msg: UserQuery):
 @coordinator_protocol.on_message(model=StatusRequest, replies={ComprehensiveAnalysis})
 async def handle_status_request(ctx: Context, sender: str, msg: StatusRequest):
     try:
+        if msg.wait_seconds > 0:
+            await orchestrator.wait_for_completion(msg.proposal_id, msg.wait_seconds)
         if msg.proposal_id in orchestrator.analysis_results:
             analysis = orchestrator.analysis_results[msg.proposal_id]
-            await ctx.send(sender, analysis)
-            ctx.logger.info(f"Sent analysis for {msg.proposal_id}")
+            await ctx.send(sender, ComprehensiveAnalysis(**asdict(analysis)))
+            ctx.logger.info("Sent analysis for %s", msg.proposal_id)
         else:
             empty_analysis = ComprehensiveAnalysis(
                 proposal_id=msg.proposal_id,
@@ -401,85 +609,82 @@ async def handle_status_request(ctx: Context, sender: str, msg: StatusRequest):
             )
             await ctx.send(sender, empty_analysis)
     except Exception as e:
-        ctx.logger.error(f"Error getting analysis: {e}")
+        ctx.logger.error("Error getting analysis: %s", e)
 
 @agent.on_event("startup")
 async def startup(ctx: Context):
+    _install_queue_logging(ctx.logger)
+    asyncio.create_task(_sender_loop(ctx))
     ctx.logger.info("DAO Governance Coordinator starting up...")
-    ctx.logger.info(f"Agent address: {ctx.address}")
-    ctx.logger.info(f"Proposal Agent: {AgentAddresses.PROPOSAL_ANALYSIS}")
-    ctx.logger.info(f"Voter Agent: {AgentAddresses.VOTER_SENTIMENT}")
-    ctx.logger.info(f"Execution Agent: {AgentAddresses.EXECUTION_AUTOMATION}")
+    ctx.logger.info("Agent address: %s", ctx.address)
+    ctx.logger.info("Proposal Agent: %s", PROPOSAL_ANALYSIS_ADDR)
+    ctx.logger.info("Voter Agent: %s", VOTER_SENTIMENT_ADDR)
+    ctx.logger.info("Execution Agent: %s", EXECUTION_AUTOMATION_ADDR)
     ctx.logger.info("Ready to coordinate real agent workflows")
 
-@chat_protocol.on_message(ChatMessage)
-async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
-    await ctx.send(
-        sender,
-        ChatAcknowledgement(timestamp=datetime.now(), acknowledged_msg_id=msg.msg_id),
+async def _chat_submit(ctx: Context, args: str) -> str:
+    parts = args.strip().split(" | ")
+    if len(parts) < 3:
+        return "❌ Invalid format. Use: submit: Title | Description | Amount | Token | Submitter"
+    proposal = ProposalSubmission(
+        proposal_id=f"chat_{uuid4().hex[:8]}",
+        title=parts[0].strip(),
+        description=parts[1].strip(),
+        requested_amount=float(parts[2].strip()),
+        token_type=parts[3].strip() if len(parts) > 3 else "ETH",
+        submitter=parts[4].strip() if len(parts) > 4 else "chat_user",
+        category="chat_submission"
     )
-    message_text = "".join(item.text for item in msg.content if isinstance(item, TextContent))
-    response_text = ""
-    try:
-        if message_text.startswith("submit:"):
-            parts = message_text.replace("submit:", "").strip().split(" | ")
-            if len(parts) >= 3:
-                proposal = ProposalSubmission(
-                    proposal_id=f"chat_{uuid4().hex[:8]}",
-                    title=parts[0].strip(),
-                    description=parts[1].strip(),
-                    requested_amount=float(parts[2].strip()),
-                    token_type=parts[3].strip() if len(parts) > 3 else "ETH",
-                    submitter=parts[4].strip() if len(parts) > 4 else "chat_user",
-                    category="chat_submission"
-                )
-                status = orchestrator.start_workflow(proposal)
-                analysis_request = ProposalAnalysisRequest(
-                    proposal_id=proposal.proposal_id,
-                    proposal_text=f"Title: {proposal.title}\nDescription: {proposal.description}",
-                    requested_amount=proposal.requested_amount,
-                    token_type=proposal.token_type,
-                    submitter=proposal.submitter,
-                    category=proposal.category,
-                    treasury_balance=1000.0
-                )
-                await ctx.send(AgentAddresses.PROPOSAL_ANALYSIS, analysis_request)
-                response_text = f"✅ Proposal {proposal.proposal_id} submitted!\n"
-                response_text += f"📊 Title: {proposal.title}\n"  
-                response_text += f"💰 Amount: {proposal.requested_amount} {proposal.token_type}\n"
-                response_text += f"⏳ Status: {status.current_stage}\n"
-                response_text += f"📈 Progress: {status.progress_percentage}%\n\n"
-                response_text += f"Ask 'status {proposal.proposal_id}' to check progress!"
-            else:
-                response_text = "❌ Invalid format. Use: submit: Title | Description | Amount | Token | Submitter"
-        elif message_text.startswith("status"):
-            parts = message_text.split()
-            if len(parts) > 1:
-                proposal_id = parts[1]
-                if proposal_id in orchestrator.workflows:
-                    workflow = orchestrator.workflows[proposal_id]
-                    analysis = orchestrator.analysis_results.get(proposal_id)
-                    response_text = f"📋 **Status for {proposal_id}**\n\n"
-                    response_text += f"🎯 Stage: {workflow.current_stage}\n"
-                    response_text += f"📊 Progress: {workflow.progress_percentage:.1f}%\n"
-                    if workflow.analysis_complete:
-                        response_text += "✅ Proposal Analysis: Complete\n"
-                    if workflow.sentiment_analysis_complete:
-                        response_text += "✅ Sentiment Analysis: Complete\n"  
-                    if workflow.execution_plan_ready:
-                        response_text += "✅ Execution Plan: Ready\n"
-                    if workflow.errors:
-                        response_text += f"❌ Errors: {'; '.join(workflow.errors)}\n"
-                    if analysis and workflow.progress_percentage == 100.0:
-                        response_text += f"\n🎯 **Final Recommendation:** {analysis.final_recommendation}\n"
-                        response_text += f"🎲 Confidence: {analysis.confidence_score:.2f}\n"
-                        response_text += f"⚠️ Risk: {analysis.risk_assessment}"
-                else:
-                    response_text = f"❌ Proposal {proposal_id} not found"
-            else:
-                response_text = "❌ Please specify proposal ID. Example: 'status prop_123'"
-        elif "help" in message_text.lower():
-            response_text = """🤖 **DAO Coordinator Chat Commands**
+    status = orchestrator.start_workflow(proposal)
+    analysis_request = ProposalAnalysisRequest.model_construct(
+        proposal_id=proposal.proposal_id,
+        proposal_text=f"Title: {proposal.title}\nDescription: {proposal.description}",
+        requested_amount=proposal.requested_amount,
+        token_type=proposal.token_type,
+        recipient_address=None,
+        submitter=proposal.submitter,
+        category=proposal.category,
+        treasury_balance=1000.0
+    )
+    await ctx.send(PROPOSAL_ANALYSIS_ADDR, analysis_request)
+    parts = [
+        f"✅ Proposal {proposal.proposal_id} submitted!\n",
+        f"📊 Title: {proposal.title}\n",
+        f"💰 Amount: {proposal.requested_amount} {proposal.token_type}\n",
+        f"⏳ Status: {status.current_stage}\n",
+        f"📈 Progress: {status.progress_percentage}%\n\n",
+        f"Ask 'status {proposal.proposal_id}' to check progress!",
+    ]
+    return "".join(parts)
+
+async def _chat_status(ctx: Context, args: str) -> str:
+    parts = args.split()
+    if not parts:
+        return "❌ Please specify proposal ID. Example: 'status prop_123'"
+    proposal_id = parts[0]
+    if proposal_id not in orchestrator.workflows:
+        return f"❌ Proposal {proposal_id} not found"
+    workflow = orchestrator.workflows[proposal_id]
+    analysis = orchestrator.analysis_results.get(proposal_id)
+    parts = [f"📋 **Status for {proposal_id}**\n\n"]
+    parts.append(f"🎯 Stage: {workflow.current_stage}\n")
+    parts.append(f"📊 Progress: {workflow.progress_percentage:.1f}%\n")
+    if workflow.analysis_complete:
+        parts.append("✅ Proposal Analysis: Complete\n")
+    if workflow.sentiment_analysis_complete:
+        parts.append("✅ Sentiment Analysis: Complete\n")
+    if workflow.execution_plan_ready:
+        parts.append("✅ Execution Plan: Ready\n")
+    errors = orchestrator.get_errors(proposal_id)
+    if errors:
+        parts.append(f"❌ Errors: {'; '.join(errors)}\n")
+    if analysis and workflow.progress_percentage == 100.0:
+        parts.append(f"\n🎯 **Final Recommendation:** {analysis.final_recommendation}\n")
+        parts.append(f"🎲 Confidence: {analysis.confidence_score:.2f}\n")
+        parts.append(f"⚠️ Risk: {analysis.risk_assessment}")
+    return "".join(parts)
+
+_HELP_TEXT = """🤖 **DAO Coordinator Chat Commands**
 
 📝 **Submit Proposal:**
 `submit: Title | Description | Amount | Token | Submitter`
@@ -499,31 +704,98 @@ The coordinator will automatically process proposals through all three specializ
 1. 🔍 Proposal Analysis (with Pyth market data)
 2. 🗳️ Voter Sentiment Prediction
 3. ⚡ Execution Planning & Safety Checks"""
-        elif "summary" in message_text.lower():
-            total = len(orchestrator.workflows)
-            completed = len([w for w in orchestrator.workflows.values() if w.progress_percentage == 100.0])
-            in_progress = total - completed
-            response_text = f"📊 **DAO Governance Summary**\n\n"
-            response_text += f"📝 Total Proposals: {total}\n"
-            response_text += f"✅ Completed: {completed}\n"
-            response_text += f"⏳ In Progress: {in_progress}\n"
-            if orchestrator.analysis_results:
-                approved = len([a for a in orchestrator.analysis_results.values() if "APPROVE" in a.final_recommendation])
-                rejected = len([a for a in orchestrator.analysis_results.values() if "REJECT" in a.final_recommendation])
-                response_text += f"👍 Approved: {approved}\n"
-                response_text += f"👎 Rejected: {rejected}"
+
+_FALLBACK_TEXT = "🤖 I'm the DAO Governance Coordinator!\n\nType 'help' for commands or try:\n• submit: Your Proposal | Description | Amount | ETH | your_name\n• status [proposal_id]\n• summary"
+
+async def _chat_help(ctx: Context, args: str) -> str:
+    return _HELP_TEXT
+
+async def _chat_summary(ctx: Context, args: str) -> str:
+    total = len(orchestrator.workflows)
+    completed = orchestrator._counters["completed"]
+    in_progress = total - completed
+    parts = [f"📊 **DAO Governance Summary**\n\n"]
+    parts.append(f"📝 Total Proposals: {total}\n")
+    parts.append(f"✅ Completed: {completed}\n")
+    parts.append(f"⏳ In Progress: {in_progress}\n")
+    if orchestrator.analysis_results:
+        parts.append(f"👍 Approved: {orchestrator._counters['approved']}\n")
+        parts.append(f"👎 Rejected: {orchestrator._counters['rejected']}")
+    return "".join(parts)
+
+async def _chat_fallback(ctx: Context, message_text: str) -> str:
+    # Slow path for free-form messages that don't start with a known command token
+    lower = message_text.lower()
+    if lower.startswith("submit:"):
+        return await _chat_submit(ctx, message_text[len("submit:"):])
+    if "help" in lower:
+        return _HELP_TEXT
+    if "summary" in lower:
+        return await _chat_summary(ctx, "")
+    return _FALLBACK_TEXT
+
+# Outbound chat messages are queued and drained by a background task so
+# handlers can move on to the next message while earlier replies are still
+# in flight on the transport. Bounded so a dead transport can't grow it
+# without limit.
+_OUT_QUEUE: asyncio.Queue = asyncio.Queue(maxsize=1024)
+
+async def _sender_loop(ctx: Context):
+    while True:
+        sender, message = await _OUT_QUEUE.get()
+        try:
+            await ctx.send(sender, message)
+        except Exception as e:
+            ctx.logger.error("Error sending queued chat message: %s", e)
+        finally:
+            _OUT_QUEUE.task_done()
+
+# Single-pass command parser: one regex match classifies the message and
+# captures its arguments instead of multiple startswith/replace/split scans
+_CMD_RE = re.compile(
+    r"^(?:submit:\s*(?P<body>.+)|status(?:\s+(?P<pid>\S+))?(?:\s.*)?|(?P<simple>summary|help))\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+@chat_protocol.on_message(ChatMessage)
+async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
+    # The chat spec has no ack-piggyback field, so the ack is a separate
+    # message; since the reply is ready within the same turn, send both in
+    # one gather instead of paying two sequential round-trips.
+    ack = ChatAcknowledgement(timestamp=datetime.now(), acknowledged_msg_id=msg.msg_id)
+    message_text = "".join(item.text for item in msg.content if isinstance(item, TextContent))
+    try:
+        m = _CMD_RE.match(message_text)
+        if m is None:
+            response_text = await _chat_fallback(ctx, message_text)
+        elif m["body"] is not None:
+            response_text = await _chat_submit(ctx, m["body"])
+        elif m["simple"] is not None:
+            if m["simple"].lower() == "help":
+                response_text = await _chat_help(ctx, "")
+            else:
+                response_text = await _chat_summary(ctx, "")
         else:
-            response_text = "🤖 I'm the DAO Governance Coordinator!\n\nType 'help' for commands or try:\n• submit: Your Proposal | Description | Amount | ETH | your_name\n• status [proposal_id]\n• summary"
+            response_text = await _chat_status(ctx, m["pid"] or "")
     except Exception as e:
         response_text = f"❌ Error: {str(e)}\n\nType 'help' for valid commands."
-    await ctx.send(sender, ChatMessage(
+    reply = ChatMessage(
         timestamp=datetime.utcnow(),
         msg_id=uuid4(),
         content=[
             TextContent(type="text", text=response_text),
             EndSessionContent(type="end-session"),
         ]
-    ))
+    )
+    for message in (ack, reply):
+        try:
+            _OUT_QUEUE.put_nowait((sender, message))
+        except asyncio.QueueFull:
+            # Back-pressure: the sender loop is saturated, send inline instead
+            try:
+                await ctx.send(sender, message)
+            except Exception as e:
+                ctx.logger.error("Error sending chat message: %s", e)
 
 @chat_protocol.on_message(ChatAcknowledgement)
 async def handle_chat_ack(ctx: Context, sender: str, msg: ChatAcknowledgement):
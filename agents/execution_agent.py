@@ -1,7 +1,8 @@
-from datetime import datetime
+import functools
+from datetime import datetime, timezone
 from uuid import uuid4
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 from uagents import Context, Protocol, Agent
 from uagents_core.contrib.protocols.chat import (
     ChatAcknowledgement,
@@ -22,13 +23,16 @@ from uagents_core.contrib.protocols.chat import (
 
 # the subject that this assistant is an expert in
 
-client = OpenAI(
-    # By default, we are using the ASI-1 LLM endpoint and model
-    base_url='https://api.asi1.ai/v1',
+@functools.lru_cache(maxsize=1)
+def get_client() -> AsyncOpenAI:
+    """Build the shared ASI-1 client lazily, on first use"""
+    return AsyncOpenAI(
+        # By default, we are using the ASI-1 LLM endpoint and model
+        base_url='https://api.asi1.ai/v1',
 
-    # You can get an ASI-1 api key by creating an account at https://asi1.ai/dashboard/api-keys
-    api_key='sk_42c1b4efbd0a4e299e25898bdb151d29aebba1181f964cf19f225f6446f5cd60',
-)
+        # You can get an ASI-1 api key by creating an account at https://asi1.ai/dashboard/api-keys
+        api_key='sk_42c1b4efbd0a4e299e25898bdb151d29aebba1181f964cf19f225f6446f5cd60',
+    )
 
 agent = Agent()
 
@@ -47,10 +51,7 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
     )
 
     # collect up all the text chunks
-    text = ''
-    for item in msg.content:
-        if isinstance(item, TextContent):
-            text += item.text
+    text = ''.join(item.text for item in msg.content if isinstance(item, TextContent))
 
     # query the model based on the user question
     # Remove the subject matter
@@ -64,24 +65,30 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
     """
 
     try:
-        # query the model
-        r = client.chat.completions.create(
+        # query the model, streaming tokens as they are generated
+        stream = await get_client().chat.completions.create(
             model="asi1-mini",
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": text},
             ],
-            max_tokens=2048,
+            max_tokens=512,
+            stream=True,
         )
 
-        response = str(r.choices[0].message.content)
-    except:
+        chunks = []
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                chunks.append(chunk.choices[0].delta.content)
+
+        response = ''.join(chunks)
+    except Exception:
         ctx.logger.exception('Error querying model')
         response = "Sorry, I encountered an error processing your request."
 
     # send the response back to the user
     await ctx.send(sender, ChatMessage(
-        timestamp=datetime.utcnow(),
+        timestamp=datetime.now(timezone.utc),
         msg_id=uuid4(),
         content=[
             # we send the contents back in the chat message
@@ -1,10 +1,13 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import uuid4
 from typing import List, Dict, Optional
 import json
+import secrets
+import time
 import aiohttp
 import asyncio
-from openai import OpenAI
+from collections import OrderedDict
+from openai import AsyncOpenAI, APITimeoutError, RateLimitError
 from uagents import Context, Protocol, Agent
 from pydantic import BaseModel, Field
 import re
@@ -17,14 +20,62 @@ from uagents_core.contrib.protocols.chat import (
     chat_protocol_spec,
 )
 
+# orjson parses/serializes severalfold faster than the stdlib; fall back
+# transparently when it isn't installed
+try:
+    import orjson
+
+    def _dumps(obj, sort_keys: bool = False) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode()
+
+    def _loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _dumps(obj, sort_keys: bool = False) -> str:
+        return json.dumps(obj, sort_keys=sort_keys)
+
+    def _loads(data):
+        return json.loads(data)
+
 # ---------------------------
 # ASI-1 client setup
 # ---------------------------
-client = OpenAI(
+client = AsyncOpenAI(
     base_url='https://api.asi1.ai/v1',
     api_key='sk_42c1b4efbd0a4e299e25898bdb151d29aebba1181f964cf19f225f6446f5cd60',
 )
 
+# Cap in-flight ASI-1 calls so a proposal burst queues here instead of
+# tripping provider rate limits, and retry transient failures with backoff
+_LLM_SEM = asyncio.Semaphore(32)
+_LLM_RETRIES = 3
+
+
+async def _call_llm(messages: List[dict], max_tokens: int, temperature: float,
+                    response_format: Optional[dict] = None) -> str:
+    """Stream a completion from ASI-1, with throttling and retries"""
+    extra = {"response_format": response_format} if response_format else {}
+    async with _LLM_SEM:
+        for attempt in range(_LLM_RETRIES + 1):
+            try:
+                stream = await client.chat.completions.create(
+                    model="asi1-mini",
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True,
+                    **extra,
+                )
+                chunks = []
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        chunks.append(chunk.choices[0].delta.content)
+                return "".join(chunks)
+            except (RateLimitError, APITimeoutError):
+                if attempt == _LLM_RETRIES:
+                    raise
+                await asyncio.sleep(0.5 * (2 ** attempt))
+
 # ---------------------------
 # Swarm Communication Models
 # ---------------------------
@@ -50,7 +101,12 @@ class ProposalAnalysisResponse(BaseModel):
     similar_proposals: List[Dict] = Field(default_factory=list, description="Similar historical proposals")
     recommendations: List[str] = Field(default_factory=list, description="Recommendations")
     confidence_score: float = Field(..., ge=0.0, le=1.0, description="Analysis confidence")
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+# Pyth exponents are small integers; a precomputed table avoids a pow()
+# per price field when parsing feed responses
+_POW10 = tuple(10 ** i for i in range(19))
+
 
 # ---------------------------
 # Pyth Network Integration
@@ -66,29 +122,72 @@ class PythDataFetcher:
     }
     
     BASE_URL = 'https://hermes.pyth.network'
-    
+
+    # Pyth updates sub-second; a few seconds of staleness is fine for
+    # treasury-impact math and saves an API round trip per proposal burst
+    CACHE_TTL = 3.0
+
+    def __init__(self):
+        # One keep-alive session shared across all requests; opening a fresh
+        # session per call pays TCP+TLS handshake for every tiny price fetch
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._cache: Dict[frozenset, tuple] = {}
+        self._locks: Dict[frozenset, asyncio.Lock] = {}
+
+    async def start(self):
+        """Open the shared HTTP session (called from agent startup)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=64, ttl_dns_cache=300, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+
+    async def close(self):
+        """Close the shared HTTP session (called from agent shutdown)"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
     async def get_latest_prices(self, symbols: List[str]) -> Dict:
-        """Fetch latest prices for given symbols"""
+        """Fetch latest prices for given symbols, with a short TTL cache"""
+        key = frozenset(symbols)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        # Single-flight per symbol set: concurrent callers queue behind one
+        # fetch instead of all hitting the API for the same data
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+            result = await self._fetch_latest_prices(symbols)
+            if 'error' not in result:
+                self._cache[key] = (time.monotonic() + self.CACHE_TTL, result)
+            return result
+
+    async def _fetch_latest_prices(self, symbols: List[str]) -> Dict:
+        """Perform the actual Pyth API request"""
         try:
             feed_ids = []
             for symbol in symbols:
                 if symbol in self.PRICE_FEEDS:
                     feed_ids.append(self.PRICE_FEEDS[symbol])
-            
+
             if not feed_ids:
                 return {"error": "No valid symbols provided"}
-            
+
             feed_ids_str = ','.join(feed_ids)
             url = f"{self.BASE_URL}/api/latest_price_feeds?ids={feed_ids_str}"
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._parse_price_data(data, symbols)
-                    else:
-                        return {"error": f"HTTP {response.status}"}
-        except Exception as e:
+
+            if self._session is None or self._session.closed:
+                await self.start()
+            async with self._session.get(url, timeout=aiohttp.ClientTimeout(total=2)) as response:
+                if response.status == 200:
+                    data = await response.json(loads=_loads)
+                    return self._parse_price_data(data, symbols)
+                else:
+                    return {"error": f"HTTP {response.status}"}
+        except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError) as e:
             return {"error": str(e)}
     
     def _parse_price_data(self, raw_data: dict, symbols: List[str]) -> Dict:
@@ -100,10 +199,12 @@ class PythDataFetcher:
                 if i < len(symbols):
                     symbol = symbols[i]
                     price_data = price_feed.get('price', {})
-                    
+
+                    expo = abs(price_data.get('expo', 0))
+                    scale = _POW10[expo] if expo < len(_POW10) else 10 ** expo
                     parsed_data[symbol] = {
-                        'price': float(price_data.get('price', 0)) / (10 ** abs(price_data.get('expo', 0))),
-                        'confidence': float(price_data.get('conf', 0)) / (10 ** abs(price_data.get('expo', 0))),
+                        'price': float(price_data.get('price', 0)) / scale,
+                        'confidence': float(price_data.get('conf', 0)) / scale,
                         'timestamp': price_data.get('publish_time', 0),
                         'status': price_feed.get('status', 'unknown')
                     }
@@ -111,19 +212,72 @@ class PythDataFetcher:
         return parsed_data
 
 
+# Static analysis instructions; keeping these byte-identical across requests
+# lets the provider reuse its prompt cache instead of reprocessing the schema
+SYSTEM_PROMPT_STATIC = """
+You are a DAO Proposal Analysis Expert.
+
+⚠️ VERY IMPORTANT: Only return a single valid JSON object.
+Do not include explanations, text, or markdown.
+
+Your JSON must exactly match this schema:
+{
+"compliance": true/false,
+ "violations": ["..."],
+  "reasoning_trace": "string",
+  "technical_assessment": {
+      "feasibility": "HIGH|MEDIUM|LOW",
+      "complexity": "HIGH|MEDIUM|LOW",
+     "timeline_realistic": true/false
+ },
+  "risk_factors": ["..."],
+  "recommendations": ["..."],
+ "confidence_score": 0.0-1.0
+}
+"""
+
+
+# Static fallbacks used when Pyth is unreachable; built once at import
+# instead of on every analysis call
+FALLBACK_PRICES = {
+    'ETH': 2400.0,
+    'BTC': 43000.0,
+    'SOL': 95.0,
+    'USDC': 1.0,
+}
+
+FALLBACK_MARKET = {
+    'ETH/USD': {'price': 2400.0, 'confidence': 0.5, 'status': 'fallback'},
+    'BTC/USD': {'price': 43000.0, 'confidence': 0.5, 'status': 'fallback'},
+    'SOL/USD': {'price': 95.0, 'confidence': 0.5, 'status': 'fallback'},
+}
+
+# Static fields shared by every error response; model_construct at the
+# failure sites skips Pydantic validation of these known-good values
+_ERROR_TEMPLATE = {
+    "compliance": False,
+    "technical_assessment": {"feasibility": "UNKNOWN"},
+    "similar_proposals": [],
+}
+
+# Network/parse failures we deliberately swallow when falling back to static
+# prices; anything else (including CancelledError) should propagate
+_FETCH_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError, KeyError, ValueError)
+
+
 def safe_parse_json(content: str) -> dict:
     """
     Extract and safely parse JSON from ASI-1 output.
     Falls back gracefully if not valid JSON.
     """
     try:
-        return json.loads(content)
+        return _loads(content)
     except Exception:
         # Try to extract first JSON block
         match = re.search(r"\{.*\}", content, re.DOTALL)
         if match:
             try:
-                return json.loads(match.group(0))
+                return _loads(match.group(0))
             except Exception as inner_e:
                 return {"error": f"JSON parse failed: {str(inner_e)}", "raw": content}
         return {"error": "No JSON found", "raw": content}
@@ -132,43 +286,61 @@ def safe_parse_json(content: str) -> dict:
 # Enhanced Proposal Analysis Functions
 # ---------------------------
 class ProposalAnalyzer:
+    # Resubmitted proposals reuse the prior LLM verdict instead of paying
+    # for another completion; half an hour keeps verdicts reasonably fresh
+    LLM_CACHE_TTL = 1800.0
+    LLM_CACHE_SIZE = 256
+
     def __init__(self):
         self.pyth_fetcher = PythDataFetcher()
+        self._llm_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+    def _cached_verdict(self, cache_key: tuple) -> Optional[dict]:
+        """Return a cached LLM verdict if present and not expired"""
+        hit = self._llm_cache.get(cache_key)
+        if hit is not None and hit[0] > time.monotonic():
+            self._llm_cache.move_to_end(cache_key)
+            return hit[1]
+        return None
+
+    def _store_verdict(self, cache_key: tuple, verdict: dict):
+        """Store an LLM verdict, evicting the oldest entries past capacity"""
+        self._llm_cache[cache_key] = (time.monotonic() + self.LLM_CACHE_TTL, verdict)
+        self._llm_cache.move_to_end(cache_key)
+        while len(self._llm_cache) > self.LLM_CACHE_SIZE:
+            self._llm_cache.popitem(last=False)
     
-    async def analyze_financial_impact(self, proposal_data: dict, treasury_balance: float) -> dict:
+    async def analyze_financial_impact(self, proposal_data: dict, treasury_balance: float,
+                                       prefetched: Optional[Dict] = None) -> dict:
         """Analyze financial impact using real-time market data with fallback"""
         try:
             requested_amount = proposal_data.get('requested_amount', 0)
             token_type = proposal_data.get('token_type', 'ETH')
-            
-            # Fallback prices
-            fallback_prices = {
-                'ETH': 2400.0,
-                'BTC': 43000.0, 
-                'SOL': 95.0,
-                'USDC': 1.0
-            }
-            
+
             current_price = 0
             confidence = 0.5
             data_source = "fallback"
-            
-            # Try to get real-time prices from Pyth
+
+            # Use prefetched Pyth data when the caller already fetched it,
+            # otherwise hit the API directly
             try:
-                market_data = await self.pyth_fetcher.get_latest_prices([f'{token_type}/USD'])
-                
+                if prefetched is not None:
+                    market_data = prefetched
+                else:
+                    market_data = await self.pyth_fetcher.get_latest_prices([f'{token_type}/USD'])
+
                 if 'error' not in market_data and f'{token_type}/USD' in market_data:
                     price_info = market_data[f'{token_type}/USD']
                     if price_info.get('price', 0) > 0:
                         current_price = price_info['price']
                         confidence = price_info.get('confidence', 0.5)
                         data_source = "pyth_live"
-            except:
+            except _FETCH_ERRORS:
                 pass
-            
+
             # Use fallback price if Pyth failed
             if current_price == 0:
-                current_price = fallback_prices.get(token_type, 1000.0)
+                current_price = FALLBACK_PRICES.get(token_type, 1000.0)
                 data_source = "fallback_estimate"
             
             # Calculate USD value and treasury impact
@@ -188,7 +360,7 @@ class ProposalAnalyzer:
         except Exception as e:
             requested_amount = proposal_data.get('requested_amount', 0)
             token_type = proposal_data.get('token_type', 'ETH')
-            estimated_price = 2400.0 if token_type == 'ETH' else 1000.0
+            estimated_price = FALLBACK_PRICES.get(token_type, 1000.0)
             
             return {
                 "requested_amount": requested_amount,
@@ -210,38 +382,38 @@ class ProposalAnalyzer:
         else:
             return "LOW"
     
-    async def generate_market_context(self, proposal_text: str) -> dict:
+    async def generate_market_context(self, proposal_text: str,
+                                      prefetched: Optional[Dict] = None) -> dict:
         """Generate market context for the proposal with fallback"""
         try:
-            fallback_market = {
-                'ETH/USD': {'price': 2400.0, 'confidence': 0.5, 'status': 'fallback'},
-                'BTC/USD': {'price': 43000.0, 'confidence': 0.5, 'status': 'fallback'},
-                'SOL/USD': {'price': 95.0, 'confidence': 0.5, 'status': 'fallback'}
-            }
-            
-            market_data = fallback_market
+            # Shallow copy so downstream mutation can't corrupt the shared
+            # module-level fallback
+            market_data = dict(FALLBACK_MARKET)
             data_source = "fallback_prices"
-            
+
             try:
-                major_tokens = ['ETH/USD', 'BTC/USD', 'SOL/USD']
-                live_data = await self.pyth_fetcher.get_latest_prices(major_tokens)
-                
+                if prefetched is not None:
+                    live_data = prefetched
+                else:
+                    major_tokens = ['ETH/USD', 'BTC/USD', 'SOL/USD']
+                    live_data = await self.pyth_fetcher.get_latest_prices(major_tokens)
+
                 if 'error' not in live_data and len(live_data) > 0:
                     market_data = live_data
                     data_source = "pyth_live"
-            except:
+            except _FETCH_ERRORS:
                 pass
             
             return {
                 "market_snapshot": market_data,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
                 "market_sentiment": self._derive_market_sentiment(market_data),
                 "data_source": data_source
             }
         except Exception as e:
             return {
                 "market_snapshot": {'ETH/USD': {'price': 2400.0, 'status': 'error_fallback'}},
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
                 "market_sentiment": "UNKNOWN",
                 "data_source": "error_fallback",
                 "error": str(e)
@@ -261,68 +433,79 @@ class ProposalAnalyzer:
         else:
             return "HIGHLY_VOLATILE"
     
+    async def prefetch_context(self, request: ProposalAnalysisRequest) -> tuple:
+        """Fetch the financial and market context for a proposal"""
+        proposal_data = {
+            "requested_amount": request.requested_amount,
+            "token_type": request.token_type,
+            "category": request.category,
+            "recipient_address": request.recipient_address
+        }
+
+        # One Pyth request covers both analyses: fetch the union of the
+        # symbols they need, then share the result
+        symbols = ['ETH/USD', 'BTC/USD', 'SOL/USD']
+        token_pair = f"{request.token_type}/USD"
+        if token_pair not in symbols:
+            symbols.append(token_pair)
+        try:
+            prices = await self.pyth_fetcher.get_latest_prices(symbols)
+        except Exception as e:
+            prices = {"error": str(e)}
+
+        return await asyncio.gather(
+            self.analyze_financial_impact(proposal_data, request.treasury_balance, prefetched=prices),
+            self.generate_market_context(request.proposal_text, prefetched=prices),
+        )
+
     async def perform_comprehensive_analysis(self, request: ProposalAnalysisRequest) -> ProposalAnalysisResponse:
         """Perform comprehensive proposal analysis"""
-        try:
-            proposal_data = {
-                "requested_amount": request.requested_amount,
-                "token_type": request.token_type,
-                "category": request.category,
-                "recipient_address": request.recipient_address
-            }
-            
-            # Get financial analysis with real-time data
-            financial_analysis = await self.analyze_financial_impact(proposal_data, request.treasury_balance)
-            
-            # Get market context
-            market_context = await self.generate_market_context(request.proposal_text)
-            
-            # Enhanced system prompt with market data
-            system_prompt = f"""
-            You are a DAO Proposal Analysis Expert.
-
-            ⚠️ VERY IMPORTANT: Only return a single valid JSON object.
-            Do not include explanations, text, or markdown.
-
-            Your JSON must exactly match this schema:
-            {{
-            "compliance": true/false,
-             "violations": ["..."],
-              "reasoning_trace": "string",
-              "technical_assessment": {{
-                  "feasibility": "HIGH|MEDIUM|LOW",
-                  "complexity": "HIGH|MEDIUM|LOW",
-                 "timeline_realistic": true/false
-             }},
-              "risk_factors": ["..."],
-              "recommendations": ["..."],
-             "confidence_score": 0.0-1.0
-            }}
-
-            Market Data: {json.dumps(market_context)}
-            Financial Analysis: {json.dumps(financial_analysis)}
-            """
+        financial_analysis, market_context = await self.prefetch_context(request)
+        return await self.analyze_with_context(request, financial_analysis, market_context)
 
-            
-            # Get ASI-1 analysis
-            response = client.chat.completions.create(
-                model="asi1-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Proposal: {request.proposal_text}"}
-                ],
-                max_tokens=1536,
-                temperature=0.1
+    async def analyze_with_context(self, request: ProposalAnalysisRequest,
+                                   financial_analysis: dict, market_context: dict) -> ProposalAnalysisResponse:
+        """Run the LLM analysis over already-fetched context"""
+        try:
+            # Dynamic data goes in its own message so the static prompt
+            # prefix stays stable; sorted keys keep serialization
+            # deterministic for equal inputs
+            context_message = (
+                f"Market Data: {_dumps(market_context, sort_keys=True)}\n"
+                f"Financial Analysis: {_dumps(financial_analysis, sort_keys=True)}"
             )
-            
-            # Parse ASI-1 response
-            content = response.choices[0].message.content.strip()
-            asi_analysis = safe_parse_json(content)
+            # Reuse a recent verdict for an identical proposal before
+            # spending an LLM call on it
+            cache_key = (request.proposal_text, request.category, round(request.requested_amount, 2))
+            asi_analysis = self._cached_verdict(cache_key)
+
+            if asi_analysis is None:
+                # Get ASI-1 analysis
+                content = await _call_llm(
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT_STATIC},
+                        {"role": "system", "content": context_message},
+                        {"role": "user", "content": f"Proposal: {request.proposal_text}"}
+                    ],
+                    max_tokens=768,
+                    temperature=0.1,
+                    response_format={"type": "json_object"},
+                )
+
+                # Parse ASI-1 response; big payloads parse in a worker thread
+                # so the event loop keeps serving other handlers
+                content = content.strip()
+                if len(content) > 4096:
+                    asi_analysis = await asyncio.to_thread(safe_parse_json, content)
+                else:
+                    asi_analysis = safe_parse_json(content)
+
+                if "error" in asi_analysis:
+                    raise Exception(f"ASI-1 output error: {asi_analysis['error']} | raw: {asi_analysis.get('raw', '')}")
+
+                self._store_verdict(cache_key, asi_analysis)
 
-            if "error" in asi_analysis:
-                raise Exception(f"ASI-1 output error: {asi_analysis['error']} | raw: {asi_analysis.get('raw', '')}")
 
-            
             # Combine all analyses
             return ProposalAnalysisResponse(
                 proposal_id=request.proposal_id,
@@ -343,17 +526,17 @@ class ProposalAnalyzer:
             
         except Exception as e:
             # Fallback response
-            return ProposalAnalysisResponse(
+            return ProposalAnalysisResponse.model_construct(
+                **_ERROR_TEMPLATE,
                 proposal_id=request.proposal_id,
-                compliance=False,
                 violations=[f"Analysis error: {str(e)}"],
                 reasoning_trace=f"Analysis failed: {str(e)}",
                 financial_impact={"error": str(e)},
                 market_analysis={"error": str(e)},
-                technical_assessment={"feasibility": "UNKNOWN"},
                 risk_assessment={"overall_risk": "HIGH", "risk_factors": ["Analysis failure"]},
                 recommendations=["Retry analysis with manual review"],
-                confidence_score=0.1
+                confidence_score=0.1,
+                timestamp=datetime.now(timezone.utc).isoformat()
             )
 
 # ---------------------------
@@ -377,9 +560,10 @@ async def handle_chat_proposal(ctx: Context, sender: str, msg: ChatMessage):
     message_text = "".join(item.text for item in msg.content if isinstance(item, TextContent))
     
     try:
-        # Create analysis request
-        request = ProposalAnalysisRequest(
-            proposal_id=f"chat_{uuid4().hex[:8]}",
+        # Create analysis request; every field is agent-supplied, so skip
+        # Pydantic validation
+        request = ProposalAnalysisRequest.model_construct(
+            proposal_id=f"chat_{secrets.token_hex(4)}",
             proposal_text=message_text,
             requested_amount=100,
             token_type="ETH",
@@ -431,7 +615,7 @@ async def handle_chat_proposal(ctx: Context, sender: str, msg: ChatMessage):
     
     # Send response
     await ctx.send(sender, ChatMessage(
-        timestamp=datetime.utcnow(),
+        timestamp=datetime.now(timezone.utc),
         msg_id=uuid4(),
         content=[
             TextContent(type="text", text=response_text),
@@ -442,37 +626,66 @@ async def handle_chat_proposal(ctx: Context, sender: str, msg: ChatMessage):
 # ---------------------------
 # Swarm Protocol Handler
 # ---------------------------
+# Pipeline queue: requests enqueue with their Pyth prefetch already running,
+# so the next proposal's market fetch overlaps the current one's LLM call
+_ANALYSIS_QUEUE: asyncio.Queue = asyncio.Queue(maxsize=256)
+
+
+async def _analysis_worker(ctx: Context):
+    """Drain queued analysis requests one at a time, in arrival order"""
+    while True:
+        sender, msg, prefetch_task = await _ANALYSIS_QUEUE.get()
+        try:
+            financial_analysis, market_context = await prefetch_task
+            analysis = await analyzer.analyze_with_context(msg, financial_analysis, market_context)
+
+            ctx.logger.info(f"Analysis complete for {msg.proposal_id}: compliance={analysis.compliance}, confidence={analysis.confidence_score:.2f}")
+
+            await ctx.send(sender, analysis)
+        except Exception as e:
+            await _send_swarm_error(ctx, sender, msg, e)
+        finally:
+            _ANALYSIS_QUEUE.task_done()
+
+
 @swarm_protocol.on_message(model=ProposalAnalysisRequest, replies={ProposalAnalysisResponse})
 async def handle_swarm_analysis(ctx: Context, sender: str, msg: ProposalAnalysisRequest):
     """Handle structured proposal analysis requests from other agents"""
     try:
         ctx.logger.info(f"Processing analysis request for proposal {msg.proposal_id}")
-        
-        # Perform comprehensive analysis
-        analysis = await analyzer.perform_comprehensive_analysis(msg)
-        
-        ctx.logger.info(f"Analysis complete for {msg.proposal_id}: compliance={analysis.compliance}, confidence={analysis.confidence_score:.2f}")
-        
-        # Send response back to requesting agent
-        await ctx.send(sender, analysis)
-        
+
+        # Kick off the market prefetch immediately; the worker consumes it
+        # in FIFO order while later prefetches run in the background
+        prefetch_task = asyncio.create_task(analyzer.prefetch_context(msg))
+        try:
+            _ANALYSIS_QUEUE.put_nowait((sender, msg, prefetch_task))
+        except asyncio.QueueFull:
+            # Backlogged: process inline rather than dropping the request
+            financial_analysis, market_context = await prefetch_task
+            analysis = await analyzer.analyze_with_context(msg, financial_analysis, market_context)
+            await ctx.send(sender, analysis)
+
     except Exception as e:
-        ctx.logger.error(f"Error processing analysis request: {e}")
-        
-        # Send error response
-        error_response = ProposalAnalysisResponse(
-            proposal_id=msg.proposal_id,
-            compliance=False,
-            violations=[f"Processing error: {str(e)}"],
-            reasoning_trace=f"Analysis failed: {str(e)}",
-            financial_impact={"error": str(e)},
-            market_analysis={"error": str(e)},
-            technical_assessment={"feasibility": "UNKNOWN"},
-            risk_assessment={"overall_risk": "HIGH", "risk_factors": ["Processing error"]},
-            recommendations=["Retry analysis"],
-            confidence_score=0.0
-        )
-        await ctx.send(sender, error_response)
+        await _send_swarm_error(ctx, sender, msg, e)
+
+
+async def _send_swarm_error(ctx: Context, sender: str, msg: ProposalAnalysisRequest, e: Exception):
+    """Log a failed analysis request and send the error response"""
+    ctx.logger.error(f"Error processing analysis request: {e}")
+
+    error_response = ProposalAnalysisResponse.model_construct(
+        **_ERROR_TEMPLATE,
+        proposal_id=msg.proposal_id,
+        violations=[f"Processing error: {str(e)}"],
+        reasoning_trace=f"Analysis failed: {str(e)}",
+        financial_impact={"error": str(e)},
+        market_analysis={"error": str(e)},
+        risk_assessment={"overall_risk": "HIGH", "risk_factors": ["Processing error"]},
+        recommendations=["Retry analysis"],
+        confidence_score=0.0,
+        timestamp=datetime.now(timezone.utc).isoformat()
+    )
+    await ctx.send(sender, error_response)
 
 # ---------------------------
 # Chat acknowledgement handler
@@ -487,11 +700,18 @@ async def handle_ack(ctx: Context, sender: str, msg: ChatAcknowledgement):
 @agent.on_event("startup")
 async def startup(ctx: Context):
     """Agent startup event"""
+    await analyzer.pyth_fetcher.start()
+    asyncio.create_task(_analysis_worker(ctx))
     ctx.logger.info("Enhanced Proposal Analysis Agent starting up...")
     ctx.logger.info(f"Agent address: {ctx.address}")
     ctx.logger.info("Pyth Network integration ready")
     ctx.logger.info("Dual protocol support: Chat + Swarm")
 
+@agent.on_event("shutdown")
+async def shutdown(ctx: Context):
+    """Agent shutdown event"""
+    await analyzer.pyth_fetcher.close()
+
 # ---------------------------
 # Include both protocols
 # ---------------------------